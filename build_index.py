@@ -0,0 +1,44 @@
+"""
+Build a single metadata index for validation_app.py.
+
+Collects the per-article metadata.json files into `<data/DATE>/index.parquet`
+so the app can list articles with one read instead of globbing and parsing
+every file on cold start. Full metadata is still loaded per article on demand.
+Re-run whenever the data folder changes.
+
+Usage:
+    python build_index.py data/202301_samples
+"""
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+
+INDEX_COLUMNS = ["article_id", "event_type", "location_name", "coordinates", "source"]
+
+
+def _read_row(path: Path):
+    with open(path) as f:
+        data = json.load(f)
+    row = {col: data.get(col) for col in INDEX_COLUMNS}
+    row["article_id"] = path.parent.name
+    return row
+
+
+def build_index(val_dir: Path):
+    paths = sorted(val_dir.glob("*/metadata.json"))
+    # Thousands of small reads: latency bound, so overlap them across threads
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        rows = list(ex.map(_read_row, paths))
+
+    index = pd.DataFrame.from_records(rows, columns=INDEX_COLUMNS)
+    index.to_parquet(val_dir / "index.parquet", index=False)
+    return len(index)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit(f"usage: python {sys.argv[0]} <data/DATE directory>")
+    val_dir = Path(sys.argv[1])
+    print(f"Indexed {build_index(val_dir)} articles into {val_dir / 'index.parquet'}")
@@ -0,0 +1,46 @@
+"""
+Pre-decode and downscale imagery into JPEG thumbnails for validation_app.py.
+
+Thumbnails are written to `<article>/imagery/.thumbs/<stem>.jpg`; the app
+opens them instead of the full-size originals when they exist.
+
+Usage:
+    python build_thumbnails.py data/202301_samples
+"""
+import sys
+from pathlib import Path
+from PIL import Image
+
+THUMB_DIR = ".thumbs"
+MAX_SIZE = (1600, 1600)
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+def build_thumbnails(val_dir: Path):
+    written = 0
+    for imagery_dir in sorted(val_dir.glob("*/imagery")):
+        thumb_dir = imagery_dir / THUMB_DIR
+        for image_path in imagery_dir.iterdir():
+            if image_path.suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+            thumb_path = thumb_dir / f"{image_path.stem}.jpg"
+            if thumb_path.exists() and thumb_path.stat().st_mtime >= image_path.stat().st_mtime:
+                continue
+
+            with Image.open(image_path) as image:
+                # Small images are served as-is; drop any thumbnail left from a larger original
+                if image.width <= MAX_SIZE[0] and image.height <= MAX_SIZE[1]:
+                    thumb_path.unlink(missing_ok=True)
+                    continue
+                image.thumbnail(MAX_SIZE)
+                thumb_dir.mkdir(exist_ok=True)
+                image.convert("RGB").save(thumb_path, "JPEG", quality=90)
+                written += 1
+    return written
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit(f"usage: python {sys.argv[0]} <data/DATE directory>")
+    val_dir = Path(sys.argv[1])
+    print(f"Wrote {build_thumbnails(val_dir)} thumbnails under {val_dir}")
@@ -1,86 +1,138 @@
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
+import csv
 import json
+import os
+import re
+import sqlite3
+import threading
 from pathlib import Path
-from PIL import Image
-import pandas as pd
 from datetime import datetime
 import urllib.parse
+import calendar
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson  # optional, faster metadata parsing
+except ImportError:
+    orjson = None
 
 DATE = '202301_samples'
 VAL_DIR = Path(f"data/{DATE}")
-FEEDBACK_FILE = Path(f"feedback/{DATE}/feedback.csv")
+INDEX_FILE = VAL_DIR / "index.parquet"
+FEEDBACK_DB = Path(f"feedback/{DATE}/feedback.db")
+# Older CSV feedback file, carried over into FEEDBACK_DB when it is first created
+LEGACY_FEEDBACK_CSV = Path(f"feedback/{DATE}/feedback.csv")
+THUMB_DIR = ".thumbs"
+MONTHS = {m.lower(): i for i, m in enumerate(calendar.month_name) if m}  # case-insensitive, like strptime("%B")
+FEEDBACK_COLUMNS = ["article_id", "visible", "new_start_date", "new_end_date", "notes"]
+
+def _to_date(entry):
+    # {"year", "month" (full English name, any case), "day"} -> date, without strptime("%B").
+    # Returns None for entries that don't parse.
+    month = MONTHS.get(str(entry.get("month", "")).lower()) if isinstance(entry, dict) else None
+    if month is None:
+        return None
+    try:
+        return datetime(entry["year"], month, entry["day"]).date()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+# A whole "_"-separated name part in either YYYYMMDD or YYYY-MM-DD form
+_DATE_RE = re.compile(r"(?:^|_)(?:(\d{4})(\d{2})(\d{2})|(\d{4})-(\d{2})-(\d{2}))(?=_|$)")
 
 def parse_date_from_filename(name: str):
-    parts = name.split("_")
-    for p in parts:
+    for m in _DATE_RE.finditer(name):
+        g = m.groups()
+        y, mo, d = g[:3] if g[0] else g[3:]
         try:
-            if len(p) == 8 and p.isdigit():
-                return datetime.strptime(p, "%Y%m%d").date()
-            if len(p) == 10 and "-" in p:
-                return datetime.strptime(p, "%Y-%m-%d").date()
-        except Exception:
-            continue
+            return datetime(int(y), int(mo), int(d)).date()
+        except ValueError:
+            continue  # right shape but not a calendar date, e.g. 20231399
     return None
 
-def list_images(folder_path: Path):
-    if not folder_path.exists():
+@st.cache_data(show_spinner=False)
+def _list_images_cached(folder_str: str, mtime: float) -> list[tuple]:
+    # mtime is only part of the cache key so adding/removing images invalidates the entry
+    # scandir filters on raw entry names; no Path objects until the caller needs them
+    with os.scandir(folder_str) as it:
+        entries = [e for e in it if e.is_file() and e.name.lower().endswith((".jpg", ".jpeg", ".png"))]
+    # Parse each name once and hand the date back with the path
+    dated = [(e.path, parse_date_from_filename(e.name), e.name) for e in entries]
+    dated.sort(key=lambda x: x[1] or x[2])
+    return [(path, date_obj) for path, date_obj, _ in dated]
+
+def list_images(folder_path: Path, skip_dates=()):
+    """Return (image path, date parsed from its filename or None) pairs sorted by date,
+    leaving out images whose date is in skip_dates."""
+    # One stat both checks the folder exists and keys the cache
+    try:
+        mtime = os.stat(folder_path).st_mtime
+    except FileNotFoundError:
         return []
-    return sorted(
-        [f for f in folder_path.iterdir() if f.suffix.lower() in {".jpg", ".jpeg", ".png"}],
-        key=lambda f: parse_date_from_filename(f.name) or f.name
-    )
+    return [
+        (Path(p), date_obj)
+        for p, date_obj in _list_images_cached(str(folder_path), mtime)
+        if date_obj not in skip_dates
+    ]
 
-def load_image(image_path: Path):
-    return Image.open(image_path)
+@st.cache_data(max_entries=64)
+def _image_bytes(path: str, mtime: float) -> bytes:
+    # Encoded bytes go to st.image as-is, so Streamlit never re-encodes a PIL image
+    return Path(path).read_bytes()
 
-def render_image_gallery_with_captions(image_dir, sat_timeline, source, start_date=None, end_date=None):
+def load_image(image_path: Path):
+    # Prefer the downscaled copy written by build_thumbnails.py, unless the original
+    # has been replaced since it was made
+    mtime = image_path.stat().st_mtime
+    thumb_path = image_path.parent / THUMB_DIR / f"{image_path.stem}.jpg"
+    try:
+        thumb_mtime = thumb_path.stat().st_mtime
+    except FileNotFoundError:
+        thumb_mtime = None
+    if thumb_mtime is not None and thumb_mtime >= mtime:
+        return _image_bytes(str(thumb_path), thumb_mtime)
+    return _image_bytes(str(image_path), mtime)
+
+def build_captions(sat_timeline, start_date=None, end_date=None):
+    # Only called from the cached article_view_model, so this runs once per article
+    captions = {}
+    for entry in sat_timeline:
+        dt = _to_date(entry)
+        if dt is None:
+            continue
+        caption = entry.get("caption") or ""
+        if start_date and dt == start_date:
+            caption = '(START) ' + caption
+        if end_date and dt == end_date:
+            caption = '(END) ' + caption
+        captions[dt] = caption
+    return captions
+
+def render_image_gallery_with_captions(image_dir, captions, source):
     """
-    Uses the per-source rewrite metadata.json (new schema) ONLY for:
-      - timeline (list of {year, month, day, caption})
-      - initial_visual_success / initial_visual_reason (displayed in a separate box outside this function)
+    captions is the date->caption mapping built from the per-source rewrite
+    metadata.json timeline (see build_captions / article_view_model).
     """
-    image_files = list_images(image_dir)
+    # Images marked "obscured by clouds" are dropped while listing
+    obscured_dates = {
+        d for d, c in captions.items()
+        if isinstance(c, str) and c.strip().lower() == "obscured by clouds"
+    }
+    image_files = list_images(image_dir, obscured_dates)
 
     # No images: show a gentle message and bail.
     if not image_files:
         st.warning(f"No images found in: {image_dir}")
         return
 
-    # Build a date->caption mapping from metadata.json, if present
-    captions = {}
-    for entry in sat_timeline:
-        try:
-            dt = datetime(
-                year=entry["year"],
-                month=datetime.strptime(entry["month"], "%B").month,
-                day=entry["day"]
-            ).date()
-            captions[dt] = entry.get("caption", "")
-            if start_date and dt == start_date:
-                captions[dt] = '(START) ' + captions[dt]
-            if end_date and dt == end_date:
-                captions[dt] = '(END) ' + captions[dt]
-        except Exception:
-            continue
-
-    # Filter out images marked "obscured by clouds"
-    filtered_files = []
-    for image_path in image_files:
-        date_obj = parse_date_from_filename(image_path.name)
-        caption = captions.get(date_obj, "") if date_obj else ""
-        if isinstance(caption, str) and caption.strip().lower() == "obscured by clouds":
-            continue  # skip cloud images
-        filtered_files.append(image_path)
-    image_files = filtered_files
-
     with st.expander("Timeline Viewer", expanded=True):
         count = len(image_files)
 
         # Exactly one image: render without a slider (avoids min==max error)
         if count == 1:
-            image_path = image_files[0]
+            image_path, date_obj = image_files[0]
             image = load_image(image_path)
-            date_obj = parse_date_from_filename(image_path.name)
             caption = captions.get(date_obj, "No caption available") if date_obj else image_path.name
             st.image(image, use_container_width=True)
             st.markdown(
@@ -91,9 +143,8 @@ def render_image_gallery_with_captions(image_dir, sat_timeline, source, start_da
 
         # Multiple images: normal slider
         index = st.slider("Select Image", 0, count - 1, 0, key=source)
-        image_path = image_files[index]
+        image_path, date_obj = image_files[index]
         image = load_image(image_path)
-        date_obj = parse_date_from_filename(image_path.name)
         caption = captions.get(date_obj, "No caption available") if date_obj else image_path.name
         st.image(image, use_container_width=True)
         st.markdown(
@@ -101,90 +152,214 @@ def render_image_gallery_with_captions(image_dir, sat_timeline, source, start_da
             unsafe_allow_html=True
         )
 
-@st.cache_data
-def get_valid_articles():
-    metadata_files = list(VAL_DIR.glob(f"*/metadata.json"))
-    valid = []
-    for path in metadata_files:
-        with open(path) as f:
-            data = json.load(f)
-        if data['event_type'] != 'no change':
-            article_id = path.parent.name
-            valid.append((article_id, data))
-    return valid
+def _load_json(path):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path) as f:
+        return json.load(f)
+
+def _read_event_type(candidate):
+    # Only the event type is kept; the rest of the metadata is loaded per article on demand
+    article_id, path = candidate
+    try:
+        return article_id, _load_json(path)['event_type']
+    except FileNotFoundError:
+        return None
 
 @st.cache_data
+def list_valid_article_ids():
+    """Sorted tuple of the article ids to review (everything but "no change")."""
+    # One read of the prebuilt index (see build_index.py) instead of N metadata.json files.
+    # Adding or removing an article folder bumps VAL_DIR's mtime, so an older index is
+    # stale and the folders are scanned instead.
+    try:
+        index_is_current = INDEX_FILE.stat().st_mtime >= VAL_DIR.stat().st_mtime
+    except FileNotFoundError:
+        index_is_current = False
+    if index_is_current:
+        import pandas as pd  # deferred: only needed to read the index
+        index = pd.read_parquet(INDEX_FILE, columns=["article_id", "event_type"])
+        return tuple(sorted(index.loc[index["event_type"] != "no change", "article_id"]))
+
+    # A single scandir pass over the article folders: no glob machinery, no Path per entry
+    try:
+        with os.scandir(VAL_DIR) as it:
+            candidates = [(entry.name, os.path.join(entry.path, "metadata.json")) for entry in it if entry.is_dir()]
+    except FileNotFoundError:
+        return ()
+
+    # Small-file reads are latency bound, so overlap them across threads. Folders without a
+    # metadata.json fail fast on open instead of costing a separate existence check.
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        event_types = [result for result in ex.map(_read_event_type, candidates) if result is not None]
+    return tuple(sorted(article_id for article_id, event_type in event_types if event_type != 'no change'))
+
+@st.cache_data(show_spinner=False)
+def load_article_metadata(article_id: str):
+    return _load_json(VAL_DIR / article_id / "metadata.json")
+
+@st.cache_data(show_spinner=False)
+def article_view_model(article_id: str) -> dict:
+    # Everything derived from metadata.json that stays fixed for the article, so slider
+    # moves and button clicks don't redo the date parsing, captions and URL quoting.
+    # A plain dict of builtins: cache_data pickles it, and classes defined in this script
+    # are recreated on every run. start_date/end_date are dates or None.
+    metadata = load_article_metadata(article_id)
+    start_date = _to_date(metadata.get('start_date'))
+    end_date = _to_date(metadata.get('end_date'))
+    sat_timeline = metadata.get("sat_timeline") or []
+    location_name = metadata.get("location_name", "")
+    lat, lon = metadata.get("coordinates", "").split("_", 1)
+    article_text = metadata.get("article_content", "")
+    styled_article_text = f"""
+        <div style="font-size: 1rem; line-height: 1.6; font-family: sans-serif;">
+            {article_text.replace('\n', '<br>')}
+        </div>
+        """ if article_text else ""
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "captions": build_captions(sat_timeline, start_date, end_date),
+        "location_name": location_name,
+        "lat": lat,
+        "lon": lon,
+        "maps_link_center": f"https://www.google.com/maps/search/?api=1&query={lat},{lon}",
+        "maps_link_ref": f"https://www.google.com/maps/search/?api=1&query={urllib.parse.quote(location_name)}",
+        "styled_article_text": styled_article_text,  # "" when the article has no text
+    }
+
+def _prefetch_article(article_id: str):
+    # Warm the caches the next page render will hit
+    article_view_model(article_id)
+    list_images(VAL_DIR / article_id / "imagery")
+
+@st.cache_resource
+def _prefetch_pool():
+    # One small pool for the whole server; the script body re-runs on every interaction
+    return ThreadPoolExecutor(max_workers=2)
+
+@st.cache_resource
+def _gcs_client():
+    # Imported here so google-cloud-storage is only needed when article text is fetched
+    from google.cloud import storage
+    return storage.Client()
+
+@st.cache_data(ttl=3600)
 def get_article_text(article_id: str):
     try:
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(BUCKET_NAME)
+        bucket = _gcs_client().bucket(BUCKET_NAME)
         blob = bucket.blob(f"{GCS_PREFIX}/{article_id}.md")
         return blob.download_as_text()
     except Exception as e:
         print(f"[WARN] Could not fetch article text for {article_id}: {e}")
         return None
 
-def write_feedback(article_id, feedback, note=None):
-    FEEDBACK_FILE.parent.mkdir(parents=True, exist_ok=True)
-    columns = ["article_id", "visible", "new_start_date", "new_end_date", "notes"]
-
-    if FEEDBACK_FILE.exists():
-        df = pd.read_csv(FEEDBACK_FILE, dtype="object")
-    else:
-        df = pd.DataFrame(columns=columns)
-
-    if article_id not in df["article_id"].values:
-        new_row = pd.DataFrame([[article_id] + [None]*(len(columns)-1)], columns=columns)
-        df = pd.concat([df, new_row], ignore_index=True)
+def _legacy_feedback_rows():
+    """Feedback rows from the old feedback.csv, as tuples in FEEDBACK_COLUMNS order."""
+    if not LEGACY_FEEDBACK_CSV.exists():
+        return []
+    with open(LEGACY_FEEDBACK_CSV, newline="") as f:
+        # Blank cells were unset values in the CSV; store them as NULL
+        return [tuple(rec.get(col) or None for col in FEEDBACK_COLUMNS) for rec in csv.DictReader(f)]
+
+@st.cache_resource
+def _feedback_db():
+    """One SQLite connection shared by every session; use it under _feedback_lock()."""
+    FEEDBACK_DB.parent.mkdir(parents=True, exist_ok=True)
+    # Autocommit: every write below is a single statement
+    conn = sqlite3.connect(FEEDBACK_DB, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'feedback'").fetchone() is None:
+        # First run: create the table and carry over the old feedback.csv, if any, in one
+        # transaction. The CSV is left in place.
+        conn.execute("BEGIN")
+        conn.execute(
+            "CREATE TABLE feedback (article_id TEXT PRIMARY KEY, visible TEXT,"
+            " new_start_date TEXT, new_end_date TEXT, notes TEXT)"
+        )
+        conn.executemany("INSERT OR REPLACE INTO feedback VALUES (?, ?, ?, ?, ?)", _legacy_feedback_rows())
+        conn.execute("COMMIT")
+    return conn
+
+@st.cache_resource
+def _feedback_lock():
+    # The shared connection must not be used by two sessions' threads at once
+    return threading.Lock()
+
+def get_feedback(article_id):
+    with _feedback_lock():
+        row = _feedback_db().execute("SELECT * FROM feedback WHERE article_id = ?", (article_id,)).fetchone()
+    return dict(row) if row is not None else {}
+
+def count_reviewed():
+    with _feedback_lock():
+        return _feedback_db().execute("SELECT COUNT(*) FROM feedback WHERE visible IS NOT NULL").fetchone()[0]
+
+def update_feedback(article_id, **fields):
+    """Set the given columns for one article, creating its row if needed."""
+    if not fields:
+        return
+    unknown = set(fields) - set(FEEDBACK_COLUMNS[1:])
+    if unknown:
+        raise ValueError(f"Unknown feedback columns: {sorted(unknown)}")
+    columns = ", ".join(fields)
+    placeholders = ", ".join("?" * len(fields))
+    updates = ", ".join(f"{col} = excluded.{col}" for col in fields)
+    with _feedback_lock():
+        _feedback_db().execute(
+            f"INSERT INTO feedback (article_id, {columns}) VALUES (?, {placeholders})"
+            f" ON CONFLICT (article_id) DO UPDATE SET {updates}",
+            (article_id, *fields.values()),
+        )
 
+def write_feedback(article_id, feedback, note=None):
+    fields = {}
     if feedback is not None:
-        df.loc[df["article_id"] == article_id, "visible"] = feedback
-
+        fields["visible"] = feedback
     if note is not None:
-        df.loc[df["article_id"] == article_id, "notes"] = note
-
-    df.to_csv(FEEDBACK_FILE, index=False)
-    #clear_cache()
+        fields["notes"] = note
+    update_feedback(article_id, **fields)
 
 def undo_feedback(article_id):
-    if FEEDBACK_FILE.exists():
-        df = pd.read_csv(FEEDBACK_FILE, dtype="object")
-        if article_id in df["article_id"].values:
-            df.loc[df["article_id"] == article_id, "visible"] = pd.NA
-            df.to_csv(FEEDBACK_FILE, index=False)
-    #clear_cache()
-
+    update_feedback(article_id, visible=None)
+
+
+# Static UI text, built once and sent as a single element each rerun
+INSTRUCTIONS_HTML = """
+<h3>Instructions</h3>
+<ol>
+<li>Review the article and initial extracted captions and timeline.</li>
+<li>Verify that the selected location corresponds with the article location.</li>
+<li>Look for the described event in the satellite imagery. Use the article, initial caption/timeline/visual assessment, and rewritten caption for context and assistance.</li>
+<li><b>Is the event visible?</b> If the change event is confidently visible, select <code>Yes</code>, otherwise select <code>No</code>.</li>
+<li><b>Start/End Dates:</b> If the event is visible, correct the start/end dates if needed. The start date should be the date of the FIRST satellite image that shows visible evidence of the event. The end date should be the date of the LAST satellite image that the event is STILL visible.</li>
+<li><b>Notes (Optional):</b> Record any important notes.</li>
+</ol>
+"""
+
+VISIBILITY_HELP_HTML = """
+<h4>Is the event visible?</h4>
+<p><code>Yes</code> if the change event is confidently visible.</p>
+<p><code>Unsure</code> if you cannot make a choice with &gt;50% confidence.</p>
+<p><code>No</code> if change event is not confidently visible.</p>
+"""
 
 ### UI start
 st.title("Sky Scraper Validation")
 
-articles = get_valid_articles()
-articles = sorted(articles, key=lambda x: x[0])
+articles = list_valid_article_ids()  # cached, already sorted
 if not articles:
     st.warning("No articles with metadata.json found.")
     st.stop()
 
-def load_feedback_df():
-    if FEEDBACK_FILE.exists():
-        return pd.read_csv(FEEDBACK_FILE, dtype="object")
-    else:
-        return pd.DataFrame(columns=["article_id", "visible", "new_start_date", "new_end_date", "notes",])
-
-feedback_df = load_feedback_df()
-
-st.markdown("### Instructions")
-st.markdown('1. Review the article and initial extracted captions and timeline.')
-st.markdown('2. Verify that the selected location corresponds with the article location.')
-st.markdown('3. Look for the described event in the satellite imagery. Use the article, initial caption/timeline/visual assessment, and rewritten caption for context and assistance.')
-st.markdown('4. **Is the event visible?** If the change event is confidently visible, select `Yes`, otherwise select `No`.')
-st.markdown('5. **Start/End Dates:** If the event is visible, correct the start/end dates if needed. The start date should be the date of the FIRST satellite image that shows visible evidence of the event. The end date should be the date of the LAST satellite image that the event is STILL visible.')
-st.markdown('6. **Notes (Optional):** Record any important notes.')
+st.markdown(INSTRUCTIONS_HTML, unsafe_allow_html=True)
 
 st.markdown("---")
 
-fully_validated = feedback_df.dropna(subset="visible")
+fully_validated = count_reviewed()
 st.markdown(
-    f"**Validation Progress:** {len(fully_validated['article_id'].unique())} of {len(articles)} articles fully reviewed"
+    f"**Validation Progress:** {fully_validated} of {len(articles)} articles fully reviewed"
 )
 
 ### Jump control (1-based UI, 0-based internal index)
@@ -214,37 +389,23 @@ with button_col:
 
 st.markdown("---")
 
-article_id, metadata = articles[st.session_state.article_index]
+article_id = articles[st.session_state.article_index]
+metadata = load_article_metadata(article_id)
+view = article_view_model(article_id)
 current_idx = st.session_state.article_index + 1
 st.markdown(f"### Article ID: `{article_id}` ({current_idx}/{len(articles)})")
 
-article_text = metadata.get("article_content", "")
-if article_text:
+if view["styled_article_text"]:
     with st.expander("View Article Text", expanded=False):
-        styled_text = f"""
-        <div style="font-size: 1rem; line-height: 1.6; font-family: sans-serif;">
-            {article_text.replace('\n', '<br>')}
-        </div>
-        """
-        st.markdown(styled_text, unsafe_allow_html=True)
-
-# Prepare rewrite metadata for both sources to collect location/coordinates (prefer planet, then sentinel)
-meta_path = VAL_DIR / article_id / "metadata.json"
-with open(meta_path) as f:
-    metadata = json.load(f)
-
-#et, ec, ivs, ivr, conf, loc, coords = read_rewrite_event_fields(meta_path)
+        st.markdown(view["styled_article_text"], unsafe_allow_html=True)
 
 et = metadata.get("event_type", "")
 ec = metadata.get("event_caption", "")
 ivs = metadata.get("initial_success")
 ivr = metadata.get("initial_visual_reason")
 conf = metadata.get("initial_confidence")
-location_name = metadata.get("location_name", "")
-coordinates = metadata.get("coordinates", "")
 orig_event_caption = metadata.get("initial_caption")
 orig_timeline = metadata.get("initial_timeline")
-sat_timeline = metadata.get("sat_timeline")
 sat_source = metadata.get("source")
 
 # Global "View original captions" dropdown
@@ -259,51 +420,27 @@ with st.expander("View Original Captions", expanded=True):
             st.markdown(f"**{date}**: {desc}")
     elif isinstance(orig_timeline, list) and orig_timeline:
         for entry in orig_timeline:
-            try:
-                dt = datetime(
-                    year=entry["year"],
-                    month=datetime.strptime(entry["month"], "%B").month,
-                    day=entry["day"]
-                ).date()
+            dt = _to_date(entry)
+            if dt is not None:
                 st.markdown(f"**{dt.isoformat()}**: {entry.get('caption', '')}")
-            except Exception:
-                continue
     else:
         st.markdown("_No timeline available_")
 
-lat, lon = coordinates.split("_", 1)
 st.markdown(f"#### Selected Location:")
-st.markdown(f"{location_name} ({lat}, {lon})")
-maps_link = f"https://www.google.com/maps/search/?api=1&query={lat},{lon}"
-st.markdown(f"[📍 ({lat}, {lon}) (Image Center)]({maps_link})")
-encoded_query = urllib.parse.quote(location_name)
-maps_link = f"https://www.google.com/maps/search/?api=1&query={encoded_query}"
-st.markdown(f"[📍 {location_name} (Reference)]({maps_link})")
+st.markdown(f"{view['location_name']} ({view['lat']}, {view['lon']})")
+st.markdown(f"[📍 ({view['lat']}, {view['lon']}) (Image Center)]({view['maps_link_center']})")
+st.markdown(f"[📍 {view['location_name']} (Reference)]({view['maps_link_ref']})")
 
 
 ### Imagery section
 st.subheader(f"{sat_source.capitalize()} Imagery")
 
 # 1) Imagery gallery (with per-image timeline captions from this source rewrite metadata)
-try:
-    _start_date = metadata['start_date']
-    start_date = datetime(
-                    year=_start_date["year"],
-                    month=datetime.strptime(_start_date["month"], "%B").month,
-                    day=_start_date["day"]
-                    ).date()
-    _end_date = metadata['end_date']
-    end_date = datetime(
-                    year=_end_date["year"],
-                    month=datetime.strptime(_end_date["month"], "%B").month,
-                    day=_end_date["day"]
-                    ).date()
-except:
-    start_date = 'N/A'
-    end_date = 'N/A'
+start_date = view["start_date"] or 'N/A'
+end_date = view["end_date"] or 'N/A'
 
 image_dir = VAL_DIR / article_id / "imagery"
-render_image_gallery_with_captions(image_dir, sat_timeline, sat_source, None if start_date == 'N/A' else start_date, None if end_date == 'N/A' else end_date)
+render_image_gallery_with_captions(image_dir, view["captions"], sat_source)
 
 # 2) Initial Visual Assessment (from this source's rewrite metadata)
 with st.expander(f"Initial Visual Assessment", expanded=False):
@@ -320,254 +457,232 @@ with st.expander(f"Rewritten", expanded=True):
     st.markdown(f"**Event Caption:** {ec}")
 
 
-# Load any existing values
-existing_visible = feedback_df.loc[feedback_df["article_id"] == article_id, "visible"].values[0] if article_id in feedback_df["article_id"].values else None
-existing_note = feedback_df.loc[feedback_df["article_id"] == article_id, "notes"].values[0] if article_id in feedback_df["article_id"].values else ""
-existing_note = "" if pd.isna(existing_note) else existing_note
-existing_start = feedback_df.loc[feedback_df["article_id"] == article_id, "new_start_date"].values[0] if article_id in feedback_df["article_id"].values else None
-existing_end = feedback_df.loc[feedback_df["article_id"] == article_id, "new_end_date"].values[0] if article_id in feedback_df["article_id"].values else None
+def _rerun_panel():
+    # Only the feedback panel needs to redraw after a click; fall back to a full
+    # rerun if the click arrived as part of a full-app run.
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
 
+@st.fragment
+def feedback_panel(article_id, start_date, end_date):
+    # Date and note widgets only rerun this panel, not the article/imagery above it;
+    # the visibility buttons rerun the whole page so the progress count stays current.
+    # Load any existing values
+    feedback = get_feedback(article_id)
+    existing_visible = feedback.get("visible")
+    existing_note = feedback.get("notes") or ""
+    existing_start = feedback.get("new_start_date")
+    existing_end = feedback.get("new_end_date")
 
-st.markdown("#### Is the event visible?")
-st.markdown("`Yes` if the change event is confidently visible.")
-st.markdown("`Unsure` if you cannot make a choice with >50% confidence.")
-st.markdown("`No` if change event is not confidently visible.")
 
+    st.markdown(VISIBILITY_HELP_HTML, unsafe_allow_html=True)
 
-# 5 columns: spacer | Yes | Unsure | No | spacer
-spacer1, col_yes, col_unsure, col_no, spacer2 = st.columns([1, 3, 3, 3, 1])
 
-# ✅ YES
-with col_yes:
-    if existing_visible == "Yes":
-        st.markdown(
-            '<div style="background-color:#2e7d32;padding:0.5em 1em;border-radius:6px;text-align:center;color:white;width:100%;"><b>✅ Selected Yes</b></div>',
-            unsafe_allow_html=True
-        )
-    else:
-        if st.button("✅ Yes", key="yes", use_container_width=True):
-            write_feedback(article_id, "Yes", existing_note)
-            st.session_state["visibility_saved"] = "Yes"
-            st.rerun()
-
-# 🤔 UNSURE
-with col_unsure:
-    if existing_visible == "Unsure":
-        st.markdown(
-            '<div style="background-color:#f9a825;padding:0.5em 1em;border-radius:6px;text-align:center;color:black;width:100%;"><b>🤔 Selected Unsure</b></div>',
-            unsafe_allow_html=True
-        )
-    else:
-        if st.button("🤔 Unsure", key="unsure", use_container_width=True):
-            write_feedback(article_id, "Unsure", existing_note)
-            st.session_state["visibility_saved"] = "Unsure"
-            st.rerun()
-
-# ❌ NO
-with col_no:
-    if existing_visible == "No":
-        st.markdown(
-            '<div style="background-color:#c62828;padding:0.5em 1em;border-radius:6px;text-align:center;color:white;width:100%;"><b>❌ Selected No</b></div>',
-            unsafe_allow_html=True
-        )
-    else:
-        if st.button("❌ No", key="no", use_container_width=True):
-            write_feedback(article_id, "No", existing_note)
-            st.session_state["visibility_saved"] = "No"
-            st.rerun()
-
-# ↩️ UNDO row below all three
-_, col_undo, _ = st.columns([4, 2, 4])
-with col_undo:
-    if existing_visible in ("Yes", "No", "Unsure"):
-        if st.button("↩️ Undo", key="undo", use_container_width=True):
-            undo_feedback(article_id)
-            st.session_state["visibility_saved"] = None
-            st.rerun()
-
-
-### Start/end dates
-st.markdown("#### Correct event start/end dates (if applicable)")
-with st.expander("Correct Event Dates", expanded=True):
-
-    start_key = f"start_date_{article_id}"
-    end_key   = f"end_date_{article_id}"
-
-    # Clear widget state ONLY when article changes
-    last_article = st.session_state.get("dates_article_id")
-    if last_article != article_id:
-        st.session_state.pop(start_key, None)
-        st.session_state.pop(end_key, None)
-        st.session_state["dates_article_id"] = article_id
-
-    # Load saved CSV values
-    saved_start = None
-    saved_end = None
-
-    if article_id in feedback_df["article_id"].values:
-        row = feedback_df.loc[feedback_df["article_id"] == article_id].iloc[0]
-
-        if isinstance(row["new_start_date"], str) and row["new_start_date"].strip():
-            saved_start = datetime.fromisoformat(row["new_start_date"]).date()
-
-        if isinstance(row["new_end_date"], str) and row["new_end_date"].strip():
-            saved_end = datetime.fromisoformat(row["new_end_date"]).date()
-
-    # FORCE CLEAR FLAGS
-    if st.session_state.pop(f"force_clear_start_{article_id}", False):
-        saved_start = None
-        st.session_state.pop(start_key, None)
+    # 5 columns: spacer | Yes | Unsure | No | spacer
+    spacer1, col_yes, col_unsure, col_no, spacer2 = st.columns([1, 3, 3, 3, 1])
 
-    if st.session_state.pop(f"force_clear_end_{article_id}", False):
+    # ✅ YES
+    with col_yes:
+        if existing_visible == "Yes":
+            st.markdown(
+                '<div style="background-color:#2e7d32;padding:0.5em 1em;border-radius:6px;text-align:center;color:white;width:100%;"><b>✅ Selected Yes</b></div>',
+                unsafe_allow_html=True
+            )
+        else:
+            if st.button("✅ Yes", key="yes", use_container_width=True):
+                write_feedback(article_id, "Yes", existing_note)
+                st.session_state["visibility_saved"] = "Yes"
+                st.rerun()
+
+    # 🤔 UNSURE
+    with col_unsure:
+        if existing_visible == "Unsure":
+            st.markdown(
+                '<div style="background-color:#f9a825;padding:0.5em 1em;border-radius:6px;text-align:center;color:black;width:100%;"><b>🤔 Selected Unsure</b></div>',
+                unsafe_allow_html=True
+            )
+        else:
+            if st.button("🤔 Unsure", key="unsure", use_container_width=True):
+                write_feedback(article_id, "Unsure", existing_note)
+                st.session_state["visibility_saved"] = "Unsure"
+                st.rerun()
+
+    # ❌ NO
+    with col_no:
+        if existing_visible == "No":
+            st.markdown(
+                '<div style="background-color:#c62828;padding:0.5em 1em;border-radius:6px;text-align:center;color:white;width:100%;"><b>❌ Selected No</b></div>',
+                unsafe_allow_html=True
+            )
+        else:
+            if st.button("❌ No", key="no", use_container_width=True):
+                write_feedback(article_id, "No", existing_note)
+                st.session_state["visibility_saved"] = "No"
+                st.rerun()
+
+    # ↩️ UNDO row below all three
+    _, col_undo, _ = st.columns([4, 2, 4])
+    with col_undo:
+        if existing_visible in ("Yes", "No", "Unsure"):
+            if st.button("↩️ Undo", key="undo", use_container_width=True):
+                undo_feedback(article_id)
+                st.session_state["visibility_saved"] = None
+                st.rerun()
+
+
+    ### Start/end dates
+    st.markdown("#### Correct event start/end dates (if applicable)")
+    with st.expander("Correct Event Dates", expanded=True):
+
+        start_key = f"start_date_{article_id}"
+        end_key   = f"end_date_{article_id}"
+
+        # Clear widget state ONLY when article changes
+        last_article = st.session_state.get("dates_article_id")
+        if last_article != article_id:
+            st.session_state.pop(start_key, None)
+            st.session_state.pop(end_key, None)
+            st.session_state["dates_article_id"] = article_id
+
+        # Load saved values
+        saved_start = None
         saved_end = None
-        st.session_state.pop(end_key, None)
-
-    # START DATE
-    st.markdown(f"**Predicted Start Date:** {start_date}")
-    col_s1, col_s2 = st.columns([4, 1])
-
-    with col_s1:
-        new_start = st.date_input(
-            " ",
-            value=saved_start,
-            key=start_key,
-            label_visibility="collapsed",
-        )
 
-    with col_s2:
-        if st.button("↩️ Clear", key=f"clear_start_{article_id}", use_container_width=True):
+        if isinstance(existing_start, str) and existing_start.strip():
+            saved_start = datetime.fromisoformat(existing_start).date()
 
-            df = pd.read_csv(FEEDBACK_FILE, dtype=str) if FEEDBACK_FILE.exists() else \
-                 pd.DataFrame(columns=["article_id","visible","new_start_date","new_end_date","notes"])
+        if isinstance(existing_end, str) and existing_end.strip():
+            saved_end = datetime.fromisoformat(existing_end).date()
 
-            if article_id not in df["article_id"].values:
-                df.loc[len(df)] = [article_id, None, "", "", ""]
+        # FORCE CLEAR FLAGS
+        if st.session_state.pop(f"force_clear_start_{article_id}", False):
+            saved_start = None
+            st.session_state.pop(start_key, None)
 
-            df.loc[df["article_id"] == article_id, "new_start_date"] = ""
-            df.to_csv(FEEDBACK_FILE, index=False)
+        if st.session_state.pop(f"force_clear_end_{article_id}", False):
+            saved_end = None
+            st.session_state.pop(end_key, None)
 
-            st.session_state[f"force_clear_start_{article_id}"] = True
-            st.session_state["date_message"] = {
-                "type": "success",
-                "text": "Cleared corrected start date."
-            }
-            st.rerun()
-
-    # END DATE
-    st.markdown(f"**Predicted End Date:** {end_date}")
-    col_e1, col_e2 = st.columns([4, 1])
-
-    with col_e1:
-        new_end = st.date_input(
-            " ",
-            value=saved_end,
-            key=end_key,
-            label_visibility="collapsed",
-        )
+        # START DATE
+        st.markdown(f"**Predicted Start Date:** {start_date}")
+        col_s1, col_s2 = st.columns([4, 1])
 
-    with col_e2:
-        if st.button("↩️ Clear", key=f"clear_end_{article_id}", use_container_width=True):
+        with col_s1:
+            new_start = st.date_input(
+                " ",
+                value=saved_start,
+                key=start_key,
+                label_visibility="collapsed",
+            )
 
-            df = pd.read_csv(FEEDBACK_FILE, dtype=str) if FEEDBACK_FILE.exists() else \
-                 pd.DataFrame(columns=["article_id","visible","new_start_date","new_end_date","notes"])
+        with col_s2:
+            if st.button("↩️ Clear", key=f"clear_start_{article_id}", use_container_width=True):
 
-            if article_id not in df["article_id"].values:
-                df.loc[len(df)] = [article_id, None, "", "", ""]
+                update_feedback(article_id, new_start_date="")
 
-            df.loc[df["article_id"] == article_id, "new_end_date"] = ""
-            df.to_csv(FEEDBACK_FILE, index=False)
+                st.session_state[f"force_clear_start_{article_id}"] = True
+                st.session_state["date_message"] = {
+                    "type": "success",
+                    "text": "Cleared corrected start date."
+                }
+                _rerun_panel()
 
-            st.session_state[f"force_clear_end_{article_id}"] = True
-            st.session_state["date_message"] = {
-                "type": "success",
-                "text": "Cleared corrected end date."
-            }
-            st.rerun()
+        # END DATE
+        st.markdown(f"**Predicted End Date:** {end_date}")
+        col_e1, col_e2 = st.columns([4, 1])
 
-    # SAVE DATES
-    if st.button("💾 Save Corrected Dates", key=f"save_dates_{article_id}", use_container_width=True):
+        with col_e1:
+            new_end = st.date_input(
+                " ",
+                value=saved_end,
+                key=end_key,
+                label_visibility="collapsed",
+            )
 
-        visible_val = None
-        if article_id in feedback_df["article_id"].values:
-            visible_val = feedback_df.loc[
-                feedback_df["article_id"] == article_id, "visible"
-            ].values[0]
+        with col_e2:
+            if st.button("↩️ Clear", key=f"clear_end_{article_id}", use_container_width=True):
 
-        if visible_val not in ("Yes", "No", "Unsure"):
-            st.session_state["date_message"] = {
-                "type": "error",
-                "text": "ERROR: Please select whether the event is visible before saving dates."
-            }
-            st.rerun()
+                update_feedback(article_id, new_end_date="")
 
-        df = pd.read_csv(FEEDBACK_FILE, dtype=str) if FEEDBACK_FILE.exists() else \
-             pd.DataFrame(columns=["article_id","visible","new_start_date","new_end_date","notes"])
+                st.session_state[f"force_clear_end_{article_id}"] = True
+                st.session_state["date_message"] = {
+                    "type": "success",
+                    "text": "Cleared corrected end date."
+                }
+                _rerun_panel()
 
-        if article_id not in df["article_id"].values:
-            df.loc[len(df)] = [article_id, visible_val, "", "", ""]
+        # SAVE DATES
+        if st.button("💾 Save Corrected Dates", key=f"save_dates_{article_id}", use_container_width=True):
 
-        df.loc[df["article_id"] == article_id, "new_start_date"] = (
-            new_start.isoformat() if new_start else ""
-        )
-        df.loc[df["article_id"] == article_id, "new_end_date"] = (
-            new_end.isoformat() if new_end else ""
-        )
+            visible_val = existing_visible
 
-        df.to_csv(FEEDBACK_FILE, index=False)
+            if visible_val not in ("Yes", "No", "Unsure"):
+                st.session_state["date_message"] = {
+                    "type": "error",
+                    "text": "ERROR: Please select whether the event is visible before saving dates."
+                }
+                _rerun_panel()
 
-        st.session_state["date_message"] = {
-            "type": "success",
-            "text": "Saved corrected dates."
-        }
-        st.rerun()
+            update_feedback(
+                article_id,
+                new_start_date=new_start.isoformat() if new_start else "",
+                new_end_date=new_end.isoformat() if new_end else "",
+            )
 
-msg = st.session_state.get("date_message")
-if msg:
-    if msg["type"] == "error":
-        st.error(msg["text"])
-    else:
-        st.success(msg["text"])
+            st.session_state["date_message"] = {
+                "type": "success",
+                "text": "Saved corrected dates."
+            }
+            _rerun_panel()
 
-    st.session_state["date_message"] = None
+    msg = st.session_state.get("date_message")
+    if msg:
+        if msg["type"] == "error":
+            st.error(msg["text"])
+        else:
+            st.success(msg["text"])
 
+        st.session_state["date_message"] = None
 
-### Notes
-note_key = f"feedback_note_{article_id}"
 
-# Clear stale notes when switching articles
-last_note_article = st.session_state.get("note_article_id")
-if last_note_article != article_id:
-    st.session_state.pop(note_key, None)
-    st.session_state["note_article_id"] = article_id
+    ### Notes
+    note_key = f"feedback_note_{article_id}"
 
-# Load note from CSV ONLY if it exists
-existing_note = ""
-if article_id in feedback_df["article_id"].values:
-    saved_note = feedback_df.loc[
-        feedback_df["article_id"] == article_id, "notes"
-    ].values[0]
+    # Clear stale notes when switching articles
+    last_note_article = st.session_state.get("note_article_id")
+    if last_note_article != article_id:
+        st.session_state.pop(note_key, None)
+        st.session_state["note_article_id"] = article_id
 
+    # Load saved note ONLY if it exists
+    existing_note = ""
+    saved_note = feedback.get("notes")
     if isinstance(saved_note, str) and saved_note.strip():
         existing_note = saved_note
 
-# Notes text area (empty unless CSV has content)
-note = st.text_area(
-    "💬 Feedback Notes (Optional)",
-    value=existing_note,
-    key=note_key,
-    height=100
-)
+    # Notes text area (empty unless a note was saved)
+    note = st.text_area(
+        "💬 Feedback Notes (Optional)",
+        value=existing_note,
+        key=note_key,
+        height=100
+    )
 
-# Save notes
-if st.button("💾 Submit Notes", key=f"submit_note_{article_id}"):
+    # Save notes
+    if st.button("💾 Submit Notes", key=f"submit_note_{article_id}"):
 
-    write_feedback(article_id, existing_visible, note)
+        write_feedback(article_id, existing_visible, note)
+
+        st.session_state["date_message"] = {
+            "type": "success",
+            "text": "Submitted notes."
+        }
+        _rerun_panel()
 
-    st.session_state["date_message"] = {
-        "type": "success",
-        "text": "Submitted notes."
-    }
-    st.rerun()
+
+feedback_panel(article_id, start_date, end_date)
 
 
 ### Navigation
@@ -582,4 +697,13 @@ with col_prev:
 with col_next:
     if st.button("Next Article ➡️", use_container_width=True):
         st.session_state.article_index = (st.session_state.article_index + 1) % len(articles)
-        st.rerun()
\ No newline at end of file
+        st.rerun()
+
+# Prefetch both neighbours in the background while this one is being reviewed,
+# once per article rather than on every slider move or click
+if st.session_state.get("prefetched_for") != article_id:
+    st.session_state["prefetched_for"] = article_id
+    for offset in (1, -1):
+        neighbour_id = articles[(st.session_state.article_index + offset) % len(articles)]
+        if neighbour_id != article_id:
+            _prefetch_pool().submit(_prefetch_article, neighbour_id)